@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+"""Shared helpers for the ccmem hook scripts.
+
+Kept free of dynamic constructs and fully annotated so it can optionally be
+compiled with mypyc; the hooks import it the same way either way.
+"""
+
+import os
+import re
+import json
+import shutil
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# orjson parses noticeably faster when available; fall back to the stdlib
+try:
+    from orjson import loads as json_loads  # type: ignore
+except ImportError:
+    from json import loads as json_loads  # type: ignore
+
+# Hooks are short-lived, so the project directory and whether it has a
+# ccmem database are resolved once at import. A deleted or unreadable
+# directory just means there is nothing to record into.
+try:
+    _CWD = os.getcwd()
+    HAS_CCMEM = (Path(_CWD) / ".claude" / "db" / "ccmem.sqlite").exists()
+except OSError:
+    _CWD = ''
+    HAS_CCMEM = False
+
+# JSON-RPC call_tool envelope, pre-serialized around the id, name and arguments
+_ENVELOPE_PREFIX = b'{"jsonrpc":"2.0","id":%d,"method":"call_tool","params":{"name":'
+_ENVELOPE_MID = b',"arguments":'
+_ENVELOPE_SUFFIX = b'}}'
+
+@lru_cache(maxsize=1)
+def _ccmem_path() -> Optional[str]:
+    """Locate the ccmem executable once per process"""
+    return shutil.which('ccmem')
+
+def call_ccmem_tools(calls: List[Tuple[str, Dict[str, Any]]],
+                     parse_response: bool = False) -> List[Optional[Dict[str, Any]]]:
+    """Call several ccmem MCP tools in a single ccmem invocation.
+
+    calls is a list of (tool_name, arguments) tuples. Requests are sent as
+    newline-delimited JSON-RPC messages. With parse_response the returned
+    list holds each response in call order, or None where a call produced
+    no response; otherwise ccmem's output is not parsed and every entry is
+    None.
+    """
+    if not calls:
+        return []
+    responses: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+    try:
+        if not HAS_CCMEM:
+            return responses
+            
+        # Prepare MCP requests, one id per call so responses can be matched up;
+        # only the name and arguments need serializing
+        requests: List[bytes] = []
+        for request_id, (tool_name, arguments) in enumerate(calls, 1):
+            requests.append(
+                _ENVELOPE_PREFIX % request_id
+                + json.dumps(tool_name).encode('utf-8')
+                + _ENVELOPE_MID
+                + json.dumps(arguments).encode('utf-8')
+                + _ENVELOPE_SUFFIX
+            )
+        
+        # Find ccmem executable
+        path = _ccmem_path()
+        if not path:
+            return responses
+            
+        # Call ccmem once for the whole batch, discarding output nobody will read
+        payload = b"\n".join(requests) + b"\n"
+        result = subprocess.run(
+            [path],
+            input=payload,
+            stdout=subprocess.PIPE if parse_response else subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd=_CWD
+        )
+        
+        if parse_response and result.returncode == 0:
+            for line in result.stdout.splitlines():
+                try:
+                    response = json_loads(line)
+                except ValueError:
+                    continue
+                response_id = response.get('id') if isinstance(response, dict) else None
+                if isinstance(response_id, int) and 1 <= response_id <= len(calls):
+                    responses[response_id - 1] = response
+        return responses
+        
+    except Exception:
+        return [None] * len(calls)
+
+def call_ccmem_tool(tool_name: str, arguments: Dict[str, Any],
+                    parse_response: bool = False) -> Optional[Dict[str, Any]]:
+    """Call a ccmem MCP tool"""
+    return call_ccmem_tools([(tool_name, arguments)], parse_response)[0]
+
+# Insight patterns, compiled once at import rather than on every hook call
+_ARCH_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'I\'ll use (\w+) (?:pattern|architecture|approach)',
+    r'This follows the (\w+) pattern',
+    r'(?:Using|Implementing) (\w+) (?:pattern|architecture)',
+    r'The (\w+) approach (?:ensures|provides|allows)',
+    r'I\'m implementing (\w+) to (?:handle|manage|ensure)'
+))
+
+_TECH_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'I\'ll use (\w+(?:\.\w+)*) (?:library|framework|tool)',
+    r'Using (\w+(?:\.\w+)*) for (?:this|the)',
+    r'(?:Installing|Adding) (\w+) (?:package|dependency)',
+    r'This requires (\w+(?:\.\w+)*) (?:to|for)'
+))
+
+_SEC_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:for security|security (?:reason|concern))',
+    r'(?:to prevent|preventing) (\w+) (?:attack|vulnerability)',
+    r'(?:authentication|authorization|validation|sanitization)',
+    r'(?:HTTPS|SSL|TLS|encryption|hashing)'
+))
+
+_PERF_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:for performance|performance (?:reason|optimization))',
+    r'(?:to optimize|optimizing) (\w+)',
+    r'(?:caching|indexing|lazy loading|pagination)',
+    r'(?:async|asynchronous|concurrent|parallel) (?:processing|execution)'
+))
+
+# Literals at least one of which every pattern above requires; responses
+# without any of them cannot produce an insight
+_TRIGGER_RE = re.compile(
+    r'pattern|architecture|approach|implementing|library|framework|tool|using|'
+    r'package|dependency|requires|security|attack|vulnerability|authentication|'
+    r'authorization|validation|sanitization|HTTPS|SSL|TLS|encryption|hashing|'
+    r'performance|optimiz|caching|indexing|lazy loading|pagination|async|'
+    r'concurrent|parallel',
+    re.IGNORECASE
+)
+
+# Insights are commentary near the top of a response, not deep inside pasted
+# logs or code, so only this many leading characters are scanned
+_MAX_SCAN_CHARS = 65536
+
+def extract_insights(response_text: str) -> List[Dict[str, str]]:
+    """Extract architectural insights and decisions from Claude's response.
+
+    Only the first _MAX_SCAN_CHARS characters are scanned, which bounds the
+    work on very large responses.
+    """
+    text = response_text[:_MAX_SCAN_CHARS]
+    insights: List[Dict[str, str]] = []
+    seen: Set[Tuple[str, str, str]] = set()
+    
+    def add_insight(insight: Dict[str, str]) -> None:
+        # Overlapping patterns often match the same phrase; keep one copy
+        key = (insight['type'], insight.get('key_concept', '').lower(), insight['content'].lower())
+        if key not in seen:
+            seen.add(key)
+            insights.append(insight)
+    
+    # One cheap scan to rule out casual responses before the full sweep
+    if not _TRIGGER_RE.search(text):
+        return insights
+    
+    # Look for architectural decisions
+    for cre in _ARCH_RES:
+        matches = cre.finditer(text)
+        for match in matches:
+            add_insight({
+                'type': 'architecture',
+                'content': match.group(0),
+                'key_concept': match.group(1)
+            })
+    
+    # Look for technology decisions
+    for cre in _TECH_RES:
+        matches = cre.finditer(text)
+        for match in matches:
+            add_insight({
+                'type': 'technology',
+                'content': match.group(0),
+                'key_concept': match.group(1)
+            })
+    
+    # Look for security considerations
+    for cre in _SEC_RES:
+        matches = cre.finditer(text)
+        for match in matches:
+            add_insight({
+                'type': 'security',
+                'content': match.group(0)
+            })
+    
+    # Look for performance considerations
+    for cre in _PERF_RES:
+        matches = cre.finditer(text)
+        for match in matches:
+            add_insight({
+                'type': 'performance',
+                'content': match.group(0)
+            })
+    
+    return insights
+
+# Commands too routine to be worth remembering, fused into one alternation
+_IGNORE_RE = re.compile(
+    r'^(?:npm install$|git status$|pwd$|ls\b|cd\b|echo\b|cat\b|head\b|tail\b)'
+)
+
+def is_significant_command(command: str) -> bool:
+    """Check if a command is significant enough to capture"""
+    return _IGNORE_RE.match(command.strip()) is None
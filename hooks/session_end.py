@@ -1,54 +1,25 @@
 #!/usr/bin/env python3
 
-import os
-import json
-import subprocess
-from pathlib import Path
+import re
 from datetime import datetime
 
-def call_ccmem_tool(tool_name, arguments):
-    """Call a ccmem MCP tool"""
-    try:
-        cwd = os.getcwd()
-        ccmem_db = Path(cwd) / ".claude" / "db" / "ccmem.sqlite"
-        
-        if not ccmem_db.exists():
-            return None
-            
-        # Prepare MCP request
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "call_tool",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-        
-        # Find ccmem executable
-        ccmem_path = subprocess.run(['which', 'ccmem'], capture_output=True, text=True)
-        if ccmem_path.returncode != 0:
-            return None
-            
-        # Call ccmem
-        result = subprocess.run(
-            [ccmem_path.stdout.strip()],
-            input=json.dumps(request),
-            capture_output=True,
-            text=True,
-            cwd=cwd
-        )
-        
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        return None
-        
-    except Exception:
-        return None
+try:
+    from _ccmem_common import HAS_CCMEM, call_ccmem_tools, json_loads
+except ImportError:
+    # Shared helper missing or out of date (e.g. left by an older install);
+    # do nothing rather than fail on every event
+    HAS_CCMEM = False
+
+# Tools that indicate real development work, matched as substrings so
+# MultiEdit, NotebookEdit and namespaced tool names count too
+_SIGNIFICANT_RE = re.compile(r'Edit|Write|Bash')
 
 def capture_session_end(hook_data):
     """Capture session end and save summary"""
+    # No ccmem database in this project; nothing to record
+    if not HAS_CCMEM:
+        return
+        
     try:
         session_duration = hook_data.get('duration', 'unknown')
         message_count = hook_data.get('message_count', 0)
@@ -66,26 +37,30 @@ def capture_session_end(hook_data):
             
         summary = ". ".join(summary_parts)
         
+        # Collect tool calls and send them to ccmem in one batch
+        calls = []
+        
         # Save session milestone
-        call_ccmem_tool("ccmem_add_knowledge", {
+        calls.append(("ccmem_add_knowledge", {
             "title": f"Session End - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
             "content": summary,
             "category": "process",
             "tags": "session,milestone,claude-code"
-        })
+        }))
         
         # If significant development work was done, create a lesson
-        significant_tools = ['Edit', 'Write', 'MultiEdit', 'Bash']
-        used_significant_tools = [tool for tool in tools_used if any(sig in tool for sig in significant_tools)]
+        used_significant_tools = [tool for tool in tools_used if isinstance(tool, str) and _SIGNIFICANT_RE.search(tool)]
         
         if len(used_significant_tools) >= 3:
-            call_ccmem_tool("ccmem_record_lesson", {
+            calls.append(("ccmem_record_lesson", {
                 "title": "Development Session Insights",
                 "description": f"Productive development session with {len(used_significant_tools)} significant actions. Tools: {', '.join(used_significant_tools[:5])}. Consider documenting any architectural decisions or patterns discovered.",
                 "category": "process",
                 "impact_level": "medium",
                 "tags": "session,development,productivity"
-            })
+            }))
+        
+        call_ccmem_tools(calls)
             
     except Exception as e:
         # Fail silently - hooks should not interrupt Claude Code
@@ -94,10 +69,14 @@ def capture_session_end(hook_data):
 if __name__ == "__main__":
     import sys
     
+    # Without the shared helper or a ccmem database there is nothing to do
+    if not HAS_CCMEM:
+        sys.exit(0)
+    
     # Read hook data from stdin or parse from arguments
     try:
         if not sys.stdin.isatty():
-            hook_data = json.load(sys.stdin)
+            hook_data = json_loads(sys.stdin.buffer.read())
         else:
             hook_data = {"trigger": "session_end"}
     except:
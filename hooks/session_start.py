@@ -1,98 +1,77 @@
 #!/usr/bin/env python3
 
 import os
-import json
-import subprocess
 from pathlib import Path
 
-def call_ccmem_tool(tool_name, arguments):
-    """Call a ccmem MCP tool"""
-    try:
-        cwd = os.getcwd()
-        ccmem_db = Path(cwd) / ".claude" / "db" / "ccmem.sqlite"
-        
-        if not ccmem_db.exists():
-            return None
-            
-        # Prepare MCP request
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "call_tool",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-        
-        # Find ccmem executable
-        ccmem_path = subprocess.run(['which', 'ccmem'], capture_output=True, text=True)
-        if ccmem_path.returncode != 0:
-            return None
-            
-        # Call ccmem
-        result = subprocess.run(
-            [ccmem_path.stdout.strip()],
-            input=json.dumps(request),
-            capture_output=True,
-            text=True,
-            cwd=cwd
-        )
-        
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        return None
-        
-    except Exception:
-        return None
+try:
+    from _ccmem_common import HAS_CCMEM, call_ccmem_tools, json_loads
+except ImportError:
+    # Shared helper missing or out of date (e.g. left by an older install);
+    # do nothing rather than fail on every event
+    HAS_CCMEM = False
 
 def capture_session_start(hook_data):
     """Capture session start and load project context"""
+    # No ccmem database in this project; nothing to record
+    if not HAS_CCMEM:
+        return
+        
     try:
+        # Collect tool calls and send them to ccmem in one batch
+        calls = []
+        
         # Add general knowledge that Claude Code session started
-        call_ccmem_tool("ccmem_add_knowledge", {
+        calls.append(("ccmem_add_knowledge", {
             "title": "Claude Code Session Started",
             "content": f"New development session started in project. Ready to assist with development tasks.",
             "category": "process",
             "tags": "session,claude-code"
-        })
+        }))
         
         # Try to detect and learn common project settings if not already known
         cwd = os.getcwd()
         
+        # One directory read instead of a stat per candidate file
+        try:
+            with os.scandir(cwd) as it:
+                entries = {entry.name for entry in it if entry.is_file()}
+        except OSError:
+            entries = set()
+        
         # Check for package.json (Node.js project)
-        package_json = Path(cwd) / "package.json"
-        if package_json.exists():
+        if 'package.json' in entries:
+            package_json = Path(cwd) / "package.json"
             try:
-                with open(package_json, 'r') as f:
-                    package_data = json.load(f)
+                with open(package_json, 'rb') as f:
+                    package_data = json_loads(f.read())
                     
+                # Only the scripts section is used
                 scripts = package_data.get('scripts', {})
                 
                 # Learn common commands
                 if 'start' in scripts:
-                    call_ccmem_tool("ccmem_learn_setting", {
+                    calls.append(("ccmem_learn_setting", {
                         "category": "start",
                         "key": "command", 
                         "value": f"npm start",
                         "description": f"Start command: {scripts['start']}"
-                    })
+                    }))
                     
                 if 'test' in scripts:
-                    call_ccmem_tool("ccmem_learn_setting", {
+                    calls.append(("ccmem_learn_setting", {
                         "category": "test",
                         "key": "command",
                         "value": f"npm test", 
                         "description": f"Test command: {scripts['test']}"
-                    })
+                    }))
                     
                 if 'build' in scripts:
-                    call_ccmem_tool("ccmem_learn_setting", {
+                    calls.append(("ccmem_learn_setting", {
                         "category": "build",
                         "key": "command",
                         "value": f"npm run build",
                         "description": f"Build command: {scripts['build']}"
-                    })
+                    }))
                     
             except Exception:
                 pass
@@ -100,37 +79,36 @@ def capture_session_start(hook_data):
         # Check for other common project files and learn from them
         
         # Go projects
-        go_mod = Path(cwd) / "go.mod"
-        if go_mod.exists():
-            call_ccmem_tool("ccmem_learn_setting", {
+        if 'go.mod' in entries:
+            calls.append(("ccmem_learn_setting", {
                 "category": "start",
                 "key": "command",
                 "value": "go run .",
                 "description": "Go project - run main package"
-            })
-            call_ccmem_tool("ccmem_learn_setting", {
+            }))
+            calls.append(("ccmem_learn_setting", {
                 "category": "test", 
                 "key": "command",
                 "value": "go test ./...",
                 "description": "Go project - run all tests"
-            })
+            }))
             
         # Python projects
-        requirements_txt = Path(cwd) / "requirements.txt"
-        pyproject_toml = Path(cwd) / "pyproject.toml"
-        if requirements_txt.exists() or pyproject_toml.exists():
-            call_ccmem_tool("ccmem_learn_setting", {
+        if 'requirements.txt' in entries or 'pyproject.toml' in entries:
+            calls.append(("ccmem_learn_setting", {
                 "category": "start",
                 "key": "command",
                 "value": "python main.py",
                 "description": "Python project - run main script"
-            })
-            call_ccmem_tool("ccmem_learn_setting", {
+            }))
+            calls.append(("ccmem_learn_setting", {
                 "category": "test",
                 "key": "command", 
                 "value": "pytest",
                 "description": "Python project - run tests with pytest"
-            })
+            }))
+        
+        call_ccmem_tools(calls)
             
     except Exception as e:
         # Fail silently - hooks should not interrupt Claude Code
@@ -139,6 +117,10 @@ def capture_session_start(hook_data):
 if __name__ == "__main__":
     import sys
     
+    # Without the shared helper or a ccmem database there is nothing to do
+    if not HAS_CCMEM:
+        sys.exit(0)
+    
     # Read hook data from stdin or command line
     if len(sys.argv) > 1:
         hook_data = {"trigger": "session_start"}
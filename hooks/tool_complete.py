@@ -1,73 +1,26 @@
 #!/usr/bin/env python3
 
 import os
-import json
-import subprocess
-from pathlib import Path
-import re
 
-def call_ccmem_tool(tool_name, arguments):
-    """Call a ccmem MCP tool"""
-    try:
-        cwd = os.getcwd()
-        ccmem_db = Path(cwd) / ".claude" / "db" / "ccmem.sqlite"
-        
-        if not ccmem_db.exists():
-            return None
-            
-        # Prepare MCP request
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "call_tool",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-        
-        # Find ccmem executable
-        ccmem_path = subprocess.run(['which', 'ccmem'], capture_output=True, text=True)
-        if ccmem_path.returncode != 0:
-            return None
-            
-        # Call ccmem
-        result = subprocess.run(
-            [ccmem_path.stdout.strip()],
-            input=json.dumps(request),
-            capture_output=True,
-            text=True,
-            cwd=cwd
-        )
-        
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        return None
-        
-    except Exception:
-        return None
+try:
+    from _ccmem_common import HAS_CCMEM, call_ccmem_tool, call_ccmem_tools, is_significant_command, json_loads
+except ImportError:
+    # Shared helper missing or out of date (e.g. left by an older install);
+    # do nothing rather than fail on every event
+    HAS_CCMEM = False
 
-def is_significant_command(command):
-    """Check if a command is significant enough to capture"""
-    ignore_patterns = [
-        r'^npm install$',
-        r'^git status$', 
-        r'^ls\b',
-        r'^pwd$',
-        r'^cd\b',
-        r'^echo\b',
-        r'^cat\b',
-        r'^head\b',
-        r'^tail\b'
-    ]
-    
-    for pattern in ignore_patterns:
-        if re.match(pattern, command.strip()):
-            return False
-    return True
+# Membership tables, built once per process rather than per tool event
+_EDIT_TOOLS = frozenset({'Edit', 'Write', 'MultiEdit'})
+_RESEARCH_TOOLS = frozenset({'WebFetch', 'WebSearch'})
+_CONFIG_FILES = frozenset({'package.json', 'go.mod', 'requirements.txt', 'Dockerfile', 'docker-compose.yml', '.env'})
+_DEPLOY_WORDS = ('deploy', 'scp', 'rsync', 'docker push', 'git push')
 
 def capture_tool_complete(hook_data):
     """Capture significant tool executions"""
+    # No ccmem database in this project; nothing to record
+    if not HAS_CCMEM:
+        return
+        
     try:
         tool_name = hook_data.get('tool_name', '')
         tool_params = hook_data.get('parameters', {})
@@ -77,29 +30,33 @@ def capture_tool_complete(hook_data):
             return
             
         # Handle file creation/editing
-        if tool_name in ['Edit', 'Write', 'MultiEdit']:
+        if tool_name in _EDIT_TOOLS:
             file_path = tool_params.get('file_path', '')
             if file_path:
                 # Extract filename for learning
                 filename = os.path.basename(file_path)
                 
+                # Collect tool calls and send them to ccmem in one batch
+                calls = []
+                
                 # Learn about file modifications
-                call_ccmem_tool("ccmem_add_knowledge", {
+                calls.append(("ccmem_add_knowledge", {
                     "title": f"File Modified: {filename}",
                     "content": f"Claude modified {file_path} using {tool_name} tool. This indicates active development on this component.",
                     "category": "development",
                     "tags": f"file-modification,{tool_name.lower()},{filename}"
-                })
+                }))
                 
                 # Detect configuration files
-                config_files = ['package.json', 'go.mod', 'requirements.txt', 'Dockerfile', 'docker-compose.yml', '.env']
-                if filename in config_files:
-                    call_ccmem_tool("ccmem_learn_setting", {
+                if filename in _CONFIG_FILES:
+                    calls.append(("ccmem_learn_setting", {
                         "category": "config",
                         "key": f"{filename}_modified",
                         "value": "true",
                         "description": f"Configuration file {filename} was recently modified"
-                    })
+                    }))
+                
+                call_ccmem_tools(calls)
         
         # Handle command execution
         elif tool_name == 'Bash':
@@ -132,7 +89,7 @@ def capture_tool_complete(hook_data):
                     })
                     
                 # Learn about deployment commands
-                elif any(deploy_word in command.lower() for deploy_word in ['deploy', 'scp', 'rsync', 'docker push', 'git push']):
+                elif any(deploy_word in command.lower() for deploy_word in _DEPLOY_WORDS):
                     call_ccmem_tool("ccmem_learn_deployment", {
                         "environment": "discovered",
                         "deployment_steps": f"Command used: {command}",
@@ -149,7 +106,7 @@ def capture_tool_complete(hook_data):
                     })
         
         # Handle other significant tools
-        elif tool_name in ['WebFetch', 'WebSearch']:
+        elif tool_name in _RESEARCH_TOOLS:
             url_or_query = tool_params.get('url') or tool_params.get('query', '')
             if url_or_query:
                 call_ccmem_tool("ccmem_add_knowledge", {
@@ -166,10 +123,14 @@ def capture_tool_complete(hook_data):
 if __name__ == "__main__":
     import sys
     
+    # Without the shared helper or a ccmem database there is nothing to do
+    if not HAS_CCMEM:
+        sys.exit(0)
+    
     # Read hook data from stdin or parse from arguments
     try:
         if not sys.stdin.isatty():
-            hook_data = json.load(sys.stdin)
+            hook_data = json_loads(sys.stdin.buffer.read())
         else:
             hook_data = {"tool_name": "unknown"}
     except:
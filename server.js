@@ -58,13 +58,29 @@ class CCMemServer {
   }
 
   setupMCPHandlers() {
-    process.stdin.on('data', (data) => {
+    // Requests are newline-delimited and stdin chunks can split them at any
+    // point, so only complete lines are parsed; the tail waits for more data
+    let buffer = '';
+    const handleLine = (line) => {
+      if (!line.trim()) return;
       try {
-        const request = JSON.parse(data.toString());
+        const request = JSON.parse(line);
         this.handleMCPRequest(request);
       } catch (error) {
         this.sendError(`Invalid JSON: ${error.message}`);
       }
+    };
+
+    process.stdin.setEncoding('utf8');
+    process.stdin.on('data', (data) => {
+      buffer += data;
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      lines.forEach(handleLine);
+    });
+    process.stdin.on('end', () => {
+      handleLine(buffer);
+      buffer = '';
     });
   }
 
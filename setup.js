@@ -1,6 +1,6 @@
 #!/usr/bin/env node
 
-import { existsSync, mkdirSync, writeFileSync, readFileSync, copyFileSync } from 'fs';
+import { existsSync, mkdirSync, writeFileSync, readFileSync, copyFileSync, readdirSync, unlinkSync, rmSync } from 'fs';
 import { join, dirname } from 'path';
 import { fileURLToPath } from 'url';
 import { execSync } from 'child_process';
@@ -111,7 +111,8 @@ class CCMemSetup {
       'session_start.py',
       'session_end.py', 
       'tool_complete.py',
-      'assistant_response.py'
+      'assistant_response.py',
+      '_ccmem_common.py'
     ];
     
     const sourceHooksDir = join(__dirname, 'hooks');
@@ -133,6 +134,8 @@ class CCMemSetup {
       }
     });
     
+    this.compileHookHelpers(hooksDir);
+    
     // Setup hooks configuration
     const hooksConfigPath = join(this.claudeDir, 'hooks_config.json');
     const hooksConfig = {
@@ -170,6 +173,25 @@ class CCMemSetup {
     console.log(`   Created: hooks_config.json`);
   }
 
+  compileHookHelpers(hooksDir) {
+    // Drop any previously compiled helper so it can't shadow the fresh source
+    readdirSync(hooksDir)
+      .filter(name => name.startsWith('_ccmem_common.') && (name.endsWith('.so') || name.endsWith('.pyd')))
+      .forEach(name => unlinkSync(join(hooksDir, name)));
+    
+    // Compile the shared hook helpers with mypyc when it is available;
+    // the hooks fall back to the plain Python module otherwise
+    try {
+      execSync('mypyc _ccmem_common.py', { cwd: hooksDir, stdio: 'ignore' });
+      console.log('   Compiled: _ccmem_common.py (mypyc)');
+    } catch (error) {
+      // mypyc not installed or compilation failed - use the .py module
+    } finally {
+      rmSync(join(hooksDir, 'build'), { recursive: true, force: true });
+      rmSync(join(hooksDir, '.mypy_cache'), { recursive: true, force: true });
+    }
+  }
+
   initializeDatabase() {
     console.log('\\n🗄️  Initializing project database...');
     